@@ -1,8 +1,223 @@
 import json
 import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple
 import os
-from collections import defaultdict
+import io
+import re
+import sys
+import time
+import heapq
+import pydoc
+import random
+from bisect import bisect_right
+from functools import lru_cache
+
+PAGE_SIZE = 20
+
+QUERY_DIMENSIONS = ('month', 'week', 'category', 'tag', 'payment_method', 'type', 'recurring')
+QUERY_MEASURES = ('sum', 'count', 'avg', 'min', 'max')
+
+BUDGET_PERIODS = ('weekly', 'monthly', 'rolling')
+
+RULE_KINDS = ('keyword', 'regex', 'amount')
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Group references and global flags would change meaning inside the combined rule pattern
+UNSUPPORTED_REGEX = re.compile(r"(?<!\\)(?:\\\\)*\\[1-9]|\(\?\(|\(\?[aiLmsux]+\)")
+
+
+@lru_cache(maxsize=4096)
+def week_of(date: str) -> str:
+    """ISO week label (YYYY-Www) for a YYYY-MM-DD date"""
+    year, week, _ = datetime.date.fromisoformat(date).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def group_keys(trans: Dict, group_by: Tuple[str, ...]) -> List[Tuple]:
+    """All group keys a transaction falls into (one per tag when grouping by tag)"""
+    keys = [()]
+    for dim in group_by:
+        if dim == 'month':
+            values = [trans['date'][:7]]
+        elif dim == 'week':
+            values = [week_of(trans['date'])]
+        elif dim == 'tag':
+            values = trans['tags'] or ['(untagged)']
+        else:
+            values = [trans[dim]]
+        keys = [key + (value,) for key in keys for value in values]
+    return keys
+
+
+def format_transaction(trans: Dict, style: str = 'detailed') -> str:
+    """Format a single transaction as detailed block, brief block or compact table row"""
+    icon = "💰" if trans['type'] == 'income' else "💸"
+    if style == 'brief':
+        return (f"\n{icon} {trans['date']} | ₹{trans['amount']:,.2f} | {trans['category']}\n"
+                f"   {trans['description']}")
+    if style == 'compact':
+        return (f"{icon} {trans['id']:>6} | {trans['date']} | ₹{trans['amount']:>12,.2f} | "
+                f"{trans['category'][:15]:15s} | {trans['payment_method'][:13]:13s} | "
+                f"{trans['description'][:30]}")
+    
+    lines = [f"\n{icon} ID: {trans['id']} | Date: {trans['date']}",
+             f"Amount: ₹{trans['amount']:,.2f} | Category: {trans['category']}",
+             f"Description: {trans['description']}",
+             f"Payment: {trans['payment_method']} | Recurring: {'Yes' if trans['recurring'] else 'No'}"]
+    if trans['tags']:
+        lines.append(f"Tags: {', '.join(trans['tags'])}")
+    lines.append("-"*90)
+    return "\n".join(lines)
+
+
+def write_output(text: str, use_pager: bool = False):
+    """Write a rendered block in one buffered write, optionally through a pager"""
+    if use_pager:
+        pydoc.pager(text)
+    else:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+
+class DailySpendWindow:
+    """Daily spending buckets for one category kept in a ring buffer
+    
+    Week-to-date, month-to-date and rolling last-N-days totals are updated
+    on every insert and as days slide past, so reading any of them is O(1).
+    Amounts are kept in paise to avoid float drift in the running sums.
+    """
+    
+    def __init__(self, rolling_days: Iterable[int] = (), today: Optional[datetime.date] = None):
+        self.rolling = {days: 0 for days in rolling_days}
+        self.size = max([31] + list(self.rolling))
+        self.buckets = [0] * self.size
+        self.day = (today or datetime.date.today()).toordinal()
+        self.week_total = 0
+        self.month_total = 0
+    
+    def advance(self, today: datetime.date):
+        """Slide the window forward to today, dropping days that fall out"""
+        target = today.toordinal()
+        if target <= self.day:
+            return
+        
+        if target - self.day >= self.size:
+            # Everything held is older than any window
+            self.buckets = [0] * self.size
+            self.rolling = dict.fromkeys(self.rolling, 0)
+            self.week_total = 0
+            self.month_total = 0
+        else:
+            for day in range(self.day + 1, target + 1):
+                for days in self.rolling:
+                    self.rolling[days] -= self.buckets[(day - days) % self.size]
+                self.buckets[day % self.size] = 0
+                date = datetime.date.fromordinal(day)
+                if date.weekday() == 0:
+                    self.week_total = 0
+                if date.day == 1:
+                    self.month_total = 0
+        self.day = target
+    
+    def add(self, date: datetime.date, amount: float):
+        """Record spending on a date (ignored if outside every window)"""
+        age = self.day - date.toordinal()
+        if age < 0 or age >= self.size:
+            return
+        
+        paise = round(amount * 100)
+        self.buckets[date.toordinal() % self.size] += paise
+        for days in self.rolling:
+            if age < days:
+                self.rolling[days] += paise
+        current = datetime.date.fromordinal(self.day)
+        if age <= current.weekday():
+            self.week_total += paise
+        if age < current.day:
+            self.month_total += paise
+    
+    def total(self, period: str, days: Optional[int] = None) -> float:
+        """Spending in the current week, month or last N days"""
+        if period == 'weekly':
+            return self.week_total / 100
+        if period == 'rolling':
+            return self.rolling[days] / 100
+        return self.month_total / 100
+
+
+class RuleSet:
+    """Categorization rules compiled into a single matcher
+    
+    Keyword rules are indexed by their word sequence, so matching a
+    description costs one dict lookup per word and phrase length no matter
+    how many rules there are. Regex rules share one combined pattern that
+    rules out most descriptions in a single search; on a hit each regex rule
+    is confirmed with its own pattern so overlapping matches are not lost.
+    Both steps still try every regex, so their cost grows with the number
+    of regex rules; prefer keyword rules for large rule sets.
+    Amount ranges are found with a binary search. Earlier rules win on
+    category and payment method; tags from every matching rule are merged.
+    """
+    
+    def __init__(self, rules: List[Dict]):
+        self.rules = rules
+        self.keywords = {}
+        self.regexes = []
+        amount_rules = []
+        bounds = set()
+        
+        for index, rule in enumerate(rules):
+            if rule['kind'] == 'keyword':
+                words = tuple(WORD_PATTERN.findall(rule['pattern'].lower()))
+                self.keywords.setdefault(words, []).append(index)
+            elif rule['kind'] == 'regex':
+                self.regexes.append((index, re.compile(rule['pattern'], re.IGNORECASE)))
+            else:
+                amount_rules.append(index)
+                bounds.add(rule['min_amount'])
+                if rule['max_amount'] is not None:
+                    bounds.add(rule['max_amount'])
+        
+        self.phrase_lengths = sorted({len(words) for words in self.keywords})
+        self.regex = re.compile('|'.join(f"(?:{pattern.pattern})" for _, pattern in self.regexes),
+                                re.IGNORECASE) if self.regexes else None
+        
+        # Segment i covers [bounds[i], bounds[i + 1]) and lists the rules spanning it
+        self.bounds = sorted(bounds)
+        self.segments = [[index for index in amount_rules
+                          if rules[index]['min_amount'] <= low
+                          and (rules[index]['max_amount'] is None or low < rules[index]['max_amount'])]
+                         for low in self.bounds]
+    
+    def match(self, description: str, amount: float, trans_type: str) -> Dict:
+        """Category, payment method and tags suggested for a transaction"""
+        matched = set()
+        
+        words = WORD_PATTERN.findall(description.lower())
+        for length in self.phrase_lengths:
+            for start in range(len(words) - length + 1):
+                hit = self.keywords.get(tuple(words[start:start + length]))
+                if hit:
+                    matched.update(hit)
+        
+        if self.regex and self.regex.search(description):
+            matched.update(index for index, pattern in self.regexes if pattern.search(description))
+        
+        segment = bisect_right(self.bounds, amount) - 1
+        if segment >= 0:
+            matched.update(self.segments[segment])
+        
+        result = {'category': None, 'payment_method': None, 'tags': []}
+        for index in sorted(matched):
+            rule = self.rules[index]
+            if rule.get('type') and rule['type'] != trans_type:
+                continue
+            result['category'] = result['category'] or rule.get('category')
+            result['payment_method'] = result['payment_method'] or rule.get('payment_method')
+            result['tags'].extend(tag for tag in rule.get('tags', []) if tag not in result['tags'])
+        return result
+
 
 class FinanceManager:
     def __init__(self, filename='finance_data.json'):
@@ -11,6 +226,15 @@ class FinanceManager:
         self.expense_categories = ['Food', 'Transport', 'Entertainment', 'Shopping', 
                                    'Bills', 'Education', 'Healthcare', 'Others']
         self.income_categories = ['Salary', 'Freelance', 'Investment', 'Gift', 'Others']
+        
+        # Older data files only had monthly budgets with free-typed categories
+        for budget in self.data['budgets']:
+            if 'monthly_limit' in budget:
+                budget['limit'] = budget.pop('monthly_limit')
+            budget.setdefault('period', 'monthly')
+            budget['category'] = self.normalize_category(budget['category'], 'expense') or budget['category']
+        self.build_budget_windows()
+        self.rule_set = RuleSet(self.data.setdefault('rules', []))
     
     def load_data(self) -> Dict:
         """Load finance data from JSON file"""
@@ -135,25 +359,29 @@ class FinanceManager:
             'budgets': [
                 {
                     'category': 'Food',
-                    'monthly_limit': 5000.00,
+                    'period': 'monthly',
+                    'limit': 5000.00,
                     'alert_threshold': 80,
                     'active': True
                 },
                 {
                     'category': 'Transport',
-                    'monthly_limit': 2000.00,
+                    'period': 'monthly',
+                    'limit': 2000.00,
                     'alert_threshold': 80,
                     'active': True
                 },
                 {
                     'category': 'Entertainment',
-                    'monthly_limit': 3000.00,
+                    'period': 'monthly',
+                    'limit': 3000.00,
                     'alert_threshold': 75,
                     'active': True
                 },
                 {
                     'category': 'Shopping',
-                    'monthly_limit': 5000.00,
+                    'period': 'monthly',
+                    'limit': 5000.00,
                     'alert_threshold': 80,
                     'active': True
                 }
@@ -187,6 +415,34 @@ class FinanceManager:
                     'status': 'active'
                 }
             ],
+            'rules': [
+                {
+                    'id': 1,
+                    'kind': 'keyword',
+                    'pattern': 'fuel',
+                    'type': 'expense',
+                    'category': 'Transport',
+                    'tags': ['fuel']
+                },
+                {
+                    'id': 2,
+                    'kind': 'regex',
+                    'pattern': r'swiggy|zomato',
+                    'type': 'expense',
+                    'category': 'Food',
+                    'payment_method': 'UPI',
+                    'tags': ['food-delivery']
+                },
+                {
+                    'id': 3,
+                    'kind': 'keyword',
+                    'pattern': 'internship stipend',
+                    'type': 'income',
+                    'category': 'Salary',
+                    'payment_method': 'Bank Transfer',
+                    'tags': ['work']
+                }
+            ],
             'investment_tracker': [
                 {
                     'id': 1,
@@ -205,10 +461,50 @@ class FinanceManager:
         with open(self.filename, 'w') as f:
             json.dump(self.data, f, indent=4)
     
+    def categories_for(self, trans_type: Optional[str]) -> List[str]:
+        """Known categories for income, expense or (None) both"""
+        if trans_type == 'income':
+            return self.income_categories
+        if trans_type == 'expense':
+            return self.expense_categories
+        return list(dict.fromkeys(self.expense_categories + self.income_categories))
+    
+    def normalize_category(self, category: str, trans_type: Optional[str]) -> Optional[str]:
+        """Known category matching the name case-insensitively, None if unknown"""
+        return next((known for known in self.categories_for(trans_type)
+                     if known.lower() == category.strip().lower()), None)
+    
+    def apply_rules(self, trans: Dict, overwrite: bool = False) -> bool:
+        """Fill category, payment method and tags of a transaction from the rules
+        
+        Blank fields are filled in; with overwrite a matching rule also replaces
+        the existing category. Returns True if anything changed.
+        """
+        match = self.rule_set.match(trans['description'], trans['amount'], trans['type'])
+        before = (trans['category'], trans['payment_method'], len(trans['tags']))
+        
+        # Never take a category from the other type's list
+        category = match['category'] and self.normalize_category(match['category'], trans['type'])
+        if category and (overwrite or not trans['category']):
+            trans['category'] = category
+        if match['payment_method'] and not trans['payment_method']:
+            trans['payment_method'] = match['payment_method']
+        trans['tags'] = trans['tags'] + [tag for tag in match['tags'] if tag not in trans['tags']]
+        trans['category'] = trans['category'] or 'Others'
+        trans['payment_method'] = trans['payment_method'] or 'Others'
+        
+        return before != (trans['category'], trans['payment_method'], len(trans['tags']))
+    
     def add_transaction(self, trans_type: str, amount: float, category: str,
                        description: str, payment_method: str, recurring: bool = False,
                        tags: List[str] = None):
-        """Add a new transaction (income or expense)"""
+        """Add a new transaction (income or expense), blank fields are auto-categorized"""
+        if category:
+            known = self.normalize_category(category, trans_type.lower())
+            if not known:
+                print(f"⚠️  Unknown category '{category}', auto-detecting instead")
+            category = known or ''
+        
         transaction = {
             'id': len(self.data['transactions']) + 1,
             'type': trans_type.lower(),
@@ -220,67 +516,263 @@ class FinanceManager:
             'recurring': recurring,
             'tags': tags or []
         }
+        self.apply_rules(transaction)
+        category = transaction['category']
         self.data['transactions'].append(transaction)
         self.save_data()
         
-        # Check budget alert if it's an expense
+        # Update budget windows and check budget alert if it's an expense
         if trans_type.lower() == 'expense':
+            window = self.budget_windows.get(category)
+            if window:
+                # The app may have been running since before midnight
+                today = datetime.date.today()
+                window.advance(today)
+                window.add(today, transaction['amount'])
             self.check_budget_alert(category)
         
-        print(f"✓ {trans_type.capitalize()} of ₹{amount:,.2f} added successfully!")
+        print(f"✓ {trans_type.capitalize()} of ₹{amount:,.2f} added successfully! (Category: {category})")
     
-    def view_transactions(self, filter_type: str = 'all', month: str = None):
-        """Display transactions with filters"""
-        transactions = self.data['transactions']
+    def add_transactions(self, rows: Iterable[Dict]):
+        """Bulk load transactions with a single save
+        
+        Rows need a type (income/expense), a positive amount and a description;
+        the date is optional (YYYY-MM-DD, default today). Invalid rows are skipped
+        and counted. Blank or unknown categories are auto-categorized like in
+        add_transaction.
+        """
+        count = 0
+        skipped = 0
+        unknown = 0
+        for row in rows:
+            try:
+                trans_type = str(row['type']).lower()
+                amount = round(float(row['amount']), 2)
+                description = row['description']
+                date = str(datetime.date.fromisoformat(row.get('date') or str(datetime.date.today())))
+                if trans_type not in ('income', 'expense') or not amount > 0 or description is None:
+                    raise ValueError
+            except (KeyError, TypeError, ValueError):
+                skipped += 1
+                continue
+            
+            category = row.get('category') or ''
+            if category:
+                known = self.normalize_category(category, trans_type)
+                unknown += not known
+                category = known or ''
+            
+            transaction = {
+                'id': len(self.data['transactions']) + 1,
+                'type': trans_type,
+                'amount': amount,
+                'category': category,
+                'description': str(description),
+                'date': date,
+                'payment_method': row.get('payment_method') or '',
+                'recurring': bool(row.get('recurring', False)),
+                'tags': list(row.get('tags') or [])
+            }
+            self.apply_rules(transaction)
+            self.data['transactions'].append(transaction)
+            count += 1
         
-        # Filter by month if specified
-        if month:
-            transactions = [t for t in transactions if t['date'].startswith(month)]
+        if count:
+            self.save_data()
+            self.build_budget_windows()
+        print(f"✓ {count:,} transactions imported successfully!")
+        if skipped:
+            print(f"❌ {skipped:,} invalid rows skipped (check type, amount, description and date)")
+        if unknown:
+            print(f"⚠️  {unknown:,} unknown categories were auto-detected instead")
+    
+    def iter_transactions(self, filter_type: str = 'all', month: str = None,
+                          keyword: str = None, start_date: str = None, end_date: str = None,
+                          category: str = None, tag: str = None, payment_method: str = None,
+                          recurring: Optional[bool] = None) -> Iterator[Dict]:
+        """Lazily yield transactions matching the given filters"""
+        keyword_lower = keyword.lower() if keyword else None
         
-        # Filter by type
-        if filter_type != 'all':
-            transactions = [t for t in transactions if t['type'] == filter_type]
+        for trans in self.data['transactions']:
+            if month and not trans['date'].startswith(month):
+                continue
+            if filter_type != 'all' and trans['type'] != filter_type:
+                continue
+            if start_date and trans['date'] < start_date:
+                continue
+            if end_date and trans['date'] > end_date:
+                continue
+            if category and trans['category'] != category:
+                continue
+            if tag and tag not in trans['tags']:
+                continue
+            if payment_method and trans['payment_method'] != payment_method:
+                continue
+            if recurring is not None and trans['recurring'] != recurring:
+                continue
+            if keyword_lower and not (keyword_lower in trans['description'].lower() or
+                                      keyword_lower in trans['category'].lower() or
+                                      keyword_lower in ' '.join(trans['tags']).lower()):
+                continue
+            yield trans
+    
+    def query(self, pivots: Dict[str, Tuple[str, ...]], measures: Tuple[str, ...] = ('sum',),
+              filter_type: str = 'all', **filters) -> Dict[str, Dict[Tuple, Dict[str, float]]]:
+        """Compute several group-by pivots over the filtered ledger in one pass
+        
+        pivots maps a result name to its group-by dimensions, e.g.
+        {'by_category': ('type', 'category')}. Filters are the same keyword
+        arguments as iter_transactions. Returns {name: {group key: {measure: value}}}.
+        """
+        for group_by in pivots.values():
+            unknown = [dim for dim in group_by if dim not in QUERY_DIMENSIONS]
+            if unknown:
+                raise ValueError(f"Unknown group-by dimension(s): {', '.join(unknown)}")
+        unknown = [m for m in measures if m not in QUERY_MEASURES]
+        if unknown:
+            raise ValueError(f"Unknown measure(s): {', '.join(unknown)}")
+        if filter_type not in ('all', 'income', 'expense'):
+            raise ValueError(f"Unknown type: {filter_type} (use income, expense or all)")
+        
+        # Accumulators per group: [sum, count, min, max]
+        groups = {name: {} for name in pivots}
+        for trans in self.iter_transactions(filter_type, **filters):
+            amount = trans['amount']
+            for name, group_by in pivots.items():
+                pivot = groups[name]
+                for key in group_keys(trans, group_by):
+                    acc = pivot.get(key)
+                    if acc is None:
+                        pivot[key] = [amount, 1, amount, amount]
+                    else:
+                        acc[0] += amount
+                        acc[1] += 1
+                        if amount < acc[2]:
+                            acc[2] = amount
+                        if amount > acc[3]:
+                            acc[3] = amount
+        
+        results = {}
+        for name, pivot in groups.items():
+            results[name] = {}
+            for key, (total, count, low, high) in pivot.items():
+                values = {'sum': total, 'count': count, 'avg': total / count, 'min': low, 'max': high}
+                results[name][key] = {m: values[m] for m in measures}
+        return results
+    
+    def view_pivot(self, group_by: Tuple[str, ...], measures: Tuple[str, ...] = ('sum',),
+                   filter_type: str = 'all', use_pager: bool = False, **filters):
+        """Display a single group-by pivot as a table"""
+        result = self.query({'pivot': group_by}, measures, filter_type, **filters)['pivot']
         
-        if not transactions:
-            print("\nNo transactions found.")
+        if not result:
+            print("\nNo transactions match this query.")
             return
         
-        # Sort by date (most recent first)
-        transactions.sort(key=lambda x: x['date'], reverse=True)
+        out = io.StringIO()
+        out.write("\n" + "="*90 + "\n")
+        out.write(f"📐 PIVOT BY {' / '.join(dim.upper() for dim in group_by) or 'ALL'}\n")
+        out.write("="*90 + "\n")
+        header = [f"{dim:15s}" for dim in group_by] + [f"{m.upper():>12s}" for m in measures]
+        out.write(" | ".join(header) + "\n")
+        out.write("-"*90 + "\n")
+        for key in sorted(result, key=lambda k: tuple(str(v) for v in k)):
+            row = [f"{str(value)[:15]:15s}" for value in key]
+            for m in measures:
+                value = result[key][m]
+                row.append(f"{value:>12,}" if m == 'count' else f"₹{value:>11,.2f}")
+            out.write(" | ".join(row) + "\n")
+        out.write("="*90 + "\n")
+        write_output(out.getvalue(), use_pager)
+    
+    def page_transactions(self, transactions: Iterable[Dict], page_size: Optional[int] = PAGE_SIZE,
+                          offset: int = 0, cursor: Tuple[str, int] = None,
+                          newest_first: bool = True):
+        """Pick one page and the net total in a single pass
         
-        print("\n" + "="*90)
-        print(f"TRANSACTIONS ({filter_type.upper()})")
-        print("="*90)
+        Rows come most recent first, or in ledger order when newest_first is
+        False. Only the top offset + page_size rows are kept in a heap, so the
+        first page of a huge ledger needs one scan and no full sort. A cursor
+        is the (date, id) of the last row already shown; the page starts after
+        it. Returns (page, net_total, matched, skipped, next_cursor).
+        """
+        if page_size is not None and page_size <= 0:
+            raise ValueError("Page size must be positive")
+        if offset < 0:
+            raise ValueError("Offset cannot be negative")
         
-        total = 0
-        for trans in transactions:
-            icon = "💰" if trans['type'] == 'income' else "💸"
-            print(f"\n{icon} ID: {trans['id']} | Date: {trans['date']}")
-            print(f"Amount: ₹{trans['amount']:,.2f} | Category: {trans['category']}")
-            print(f"Description: {trans['description']}")
-            print(f"Payment: {trans['payment_method']} | Recurring: {'Yes' if trans['recurring'] else 'No'}")
-            if trans['tags']:
-                print(f"Tags: {', '.join(trans['tags'])}")
-            print("-"*90)
-            
+        limit = offset + page_size if page_size else None
+        if cursor:
+            cursor_key = (cursor[0], -cursor[1]) if newest_first else (-cursor[1],)
+        else:
+            cursor_key = None
+        heap = []
+        net_total = 0
+        matched = 0
+        skipped = 0
+        
+        for seq, trans in enumerate(transactions):
+            matched += 1
             if trans['type'] == 'income':
-                total += trans['amount']
+                net_total += trans['amount']
             else:
-                total -= trans['amount']
+                net_total -= trans['amount']
+            
+            # Same date keeps ledger order, as the old stable sort did
+            key = (trans['date'], -trans['id']) if newest_first else (-trans['id'],)
+            if cursor_key and key >= cursor_key:
+                skipped += 1
+                continue
+            if limit is None or len(heap) < limit:
+                heapq.heappush(heap, (key, -seq, trans))
+            elif key > heap[0][0]:
+                heapq.heapreplace(heap, (key, -seq, trans))
         
-        print(f"\nNet Total: ₹{total:,.2f}")
-        print("="*90)
+        page = [trans for _, _, trans in sorted(heap, reverse=True)][offset:]
+        remaining = matched - skipped - offset - len(page)
+        next_cursor = (page[-1]['date'], page[-1]['id']) if page and remaining > 0 else None
+        return page, net_total, matched, skipped, next_cursor
     
-    def get_current_month_summary(self):
-        """Get income and expense summary for current month"""
-        current_month = datetime.date.today().strftime('%Y-%m')
-        month_transactions = [t for t in self.data['transactions'] 
-                            if t['date'].startswith(current_month)]
+    def _render_transactions(self, title: str, transactions: Iterable[Dict],
+                             page_size: Optional[int], offset: int, cursor: Tuple[str, int],
+                             style: str, use_pager: bool, empty_message: str,
+                             newest_first: bool = True):
+        """Render one page of transactions into a buffer and write it at once"""
+        page, net_total, matched, skipped, next_cursor = self.page_transactions(
+            transactions, page_size, offset, cursor, newest_first)
+        
+        if not page:
+            print(empty_message)
+            return None
+        
+        out = io.StringIO()
+        start = skipped + offset + 1
+        out.write("\n" + "="*90 + "\n")
+        out.write(f"{title} - showing {start}-{start + len(page) - 1} of {matched}\n")
+        out.write("="*90 + "\n")
+        if style == 'compact':
+            out.write(f"   {'ID':>6} | {'Date':10s} | {'Amount':>13s} | {'Category':15s} | "
+                      f"{'Payment':13s} | Description\n")
+            out.write("-"*90 + "\n")
         
-        total_income = sum(t['amount'] for t in month_transactions if t['type'] == 'income')
-        total_expense = sum(t['amount'] for t in month_transactions if t['type'] == 'expense')
+        for trans in page:
+            out.write(format_transaction(trans, style) + "\n")
         
-        return total_income, total_expense, month_transactions
+        out.write(f"\nNet Total: ₹{net_total:,.2f}\n")
+        out.write("="*90 + "\n")
+        write_output(out.getvalue(), use_pager)
+        return next_cursor
+    
+    def view_transactions(self, filter_type: str = 'all', month: str = None,
+                          page_size: Optional[int] = PAGE_SIZE, offset: int = 0,
+                          cursor: Tuple[str, int] = None, compact: bool = False,
+                          use_pager: bool = False):
+        """Display one page of transactions with filters, returns the next page cursor"""
+        return self._render_transactions(f"TRANSACTIONS ({filter_type.upper()})",
+                                         self.iter_transactions(filter_type, month),
+                                         page_size, offset, cursor,
+                                         'compact' if compact else 'detailed', use_pager,
+                                         "\nNo transactions found.")
     
     def generate_monthly_report(self):
         """Generate comprehensive monthly financial report"""
@@ -291,7 +783,13 @@ class FinanceManager:
         current_month = datetime.date.today().strftime('%Y-%m')
         month_name = datetime.date.today().strftime('%B %Y')
         
-        total_income, total_expense, month_transactions = self.get_current_month_summary()
+        # All sections come from one pass over this month's transactions
+        result = self.query({'by_type': ('type',),
+                             'by_category': ('type', 'category'),
+                             'by_payment': ('type', 'payment_method')},
+                            month=current_month)
+        total_income = result['by_type'].get(('income',), {'sum': 0})['sum']
+        total_expense = result['by_type'].get(('expense',), {'sum': 0})['sum']
         net_savings = total_income - total_expense
         savings_rate = (net_savings / total_income * 100) if total_income > 0 else 0
         
@@ -302,10 +800,9 @@ class FinanceManager:
         print(f"📈 Savings Rate: {savings_rate:.1f}%")
         
         # Category-wise expense breakdown
-        expense_by_category = defaultdict(float)
-        for trans in month_transactions:
-            if trans['type'] == 'expense':
-                expense_by_category[trans['category']] += trans['amount']
+        expense_by_category = {category: values['sum']
+                               for (trans_type, category), values in result['by_category'].items()
+                               if trans_type == 'expense'}
         
         if expense_by_category:
             print(f"\n📂 Expense Breakdown by Category:")
@@ -316,10 +813,9 @@ class FinanceManager:
                 print(f"   {category:15s}: ₹{amount:8,.2f} ({percentage:5.1f}%) {bar}")
         
         # Payment method analysis
-        payment_methods = defaultdict(float)
-        for trans in month_transactions:
-            if trans['type'] == 'expense':
-                payment_methods[trans['payment_method']] += trans['amount']
+        payment_methods = {method: values['sum']
+                           for (trans_type, method), values in result['by_payment'].items()
+                           if trans_type == 'expense'}
         
         if payment_methods:
             print(f"\n💳 Payment Method Usage:")
@@ -339,73 +835,119 @@ class FinanceManager:
         
         print("="*90)
     
-    def set_budget(self, category: str, monthly_limit: float, alert_threshold: int = 80):
-        """Set a budget limit for a category"""
+    def build_budget_windows(self):
+        """Rebuild the daily spending windows for categories with active budgets"""
+        today = datetime.date.today()
+        rolling_days = {}
+        for budget in self.data['budgets']:
+            if budget['active']:
+                days = rolling_days.setdefault(budget['category'], set())
+                if budget['period'] == 'rolling':
+                    days.add(budget['days'])
+        
+        self.budget_windows = {category: DailySpendWindow(days, today)
+                               for category, days in rolling_days.items()}
+        if not self.budget_windows:
+            return
+        
+        oldest = str(today - datetime.timedelta(days=max(w.size for w in self.budget_windows.values())))
+        for trans in self.data['transactions']:
+            if trans['type'] == 'expense' and trans['date'] > oldest:
+                window = self.budget_windows.get(trans['category'])
+                if window:
+                    window.add(datetime.date.fromisoformat(trans['date']), trans['amount'])
+    
+    def budget_spent(self, budget: Dict) -> float:
+        """Amount spent in the budget's current period"""
+        window = self.budget_windows.get(budget['category'])
+        if not window:
+            return 0.0
+        window.advance(datetime.date.today())
+        return window.total(budget['period'], budget.get('days'))
+    
+    @staticmethod
+    def budget_period_label(budget: Dict) -> str:
+        """Human readable period of a budget"""
+        if budget['period'] == 'rolling':
+            return f"Last {budget['days']} days"
+        return budget['period'].capitalize()
+    
+    def set_budget(self, category: str, limit: float, alert_threshold: int = 80,
+                   period: str = 'monthly', days: Optional[int] = None):
+        """Set a weekly, monthly or rolling last-N-days budget limit for a category"""
+        if period not in BUDGET_PERIODS:
+            print(f"❌ Invalid period! Choose from: {', '.join(BUDGET_PERIODS)}")
+            return
+        if period == 'rolling' and (not days or days <= 0):
+            print("❌ Rolling budgets need a positive number of days!")
+            return
+        if period != 'rolling':
+            days = None
+        known = self.normalize_category(category, 'expense')
+        if not known:
+            print(f"❌ Unknown category! Choose from: {', '.join(self.expense_categories)}")
+            return
+        category = known
+        
         # Check if budget already exists
         for budget in self.data['budgets']:
-            if budget['category'] == category:
-                budget['monthly_limit'] = monthly_limit
+            if (budget['category'] == category and budget['period'] == period
+                    and budget.get('days') == days):
+                budget['limit'] = limit
                 budget['alert_threshold'] = alert_threshold
                 budget['active'] = True
                 self.save_data()
-                print(f"✓ Budget for {category} updated to ₹{monthly_limit:,.2f}")
+                self.build_budget_windows()
+                print(f"✓ {self.budget_period_label(budget)} budget for {category} updated to ₹{limit:,.2f}")
                 return
         
         # Add new budget
         budget = {
             'category': category,
-            'monthly_limit': monthly_limit,
+            'period': period,
+            'limit': limit,
             'alert_threshold': alert_threshold,
             'active': True
         }
+        if days:
+            budget['days'] = days
         self.data['budgets'].append(budget)
         self.save_data()
-        print(f"✓ Budget for {category} set to ₹{monthly_limit:,.2f}")
+        self.build_budget_windows()
+        print(f"✓ {self.budget_period_label(budget)} budget for {category} set to ₹{limit:,.2f}")
     
     def check_budget_alert(self, category: str):
-        """Check if budget limit is being approached for a category"""
-        budget = next((b for b in self.data['budgets'] 
-                      if b['category'] == category and b['active']), None)
-        
-        if not budget:
-            return
-        
-        current_month = datetime.date.today().strftime('%Y-%m')
-        month_expenses = sum(t['amount'] for t in self.data['transactions']
-                           if t['type'] == 'expense' 
-                           and t['category'] == category
-                           and t['date'].startswith(current_month))
-        
-        percentage_used = (month_expenses / budget['monthly_limit'] * 100) if budget['monthly_limit'] > 0 else 0
-        
-        if percentage_used >= 100:
-            print(f"\n🚨 BUDGET EXCEEDED for {category}!")
-            print(f"   Spent: ₹{month_expenses:,.2f} / ₹{budget['monthly_limit']:,.2f}")
-            print(f"   Over budget by: ₹{month_expenses - budget['monthly_limit']:,.2f}")
-        elif percentage_used >= budget['alert_threshold']:
-            print(f"\n⚠️  BUDGET ALERT for {category}!")
-            print(f"   Spent: ₹{month_expenses:,.2f} / ₹{budget['monthly_limit']:,.2f} ({percentage_used:.1f}%)")
-            print(f"   Remaining: ₹{budget['monthly_limit'] - month_expenses:,.2f}")
+        """Check if any budget limit is being approached for a category"""
+        for budget in self.data['budgets']:
+            if budget['category'] != category or not budget['active']:
+                continue
+            
+            spent = self.budget_spent(budget)
+            label = self.budget_period_label(budget)
+            percentage_used = (spent / budget['limit'] * 100) if budget['limit'] > 0 else 0
+            
+            if percentage_used >= 100:
+                print(f"\n🚨 BUDGET EXCEEDED for {category} ({label})!")
+                print(f"   Spent: ₹{spent:,.2f} / ₹{budget['limit']:,.2f}")
+                print(f"   Over budget by: ₹{spent - budget['limit']:,.2f}")
+            elif percentage_used >= budget['alert_threshold']:
+                print(f"\n⚠️  BUDGET ALERT for {category} ({label})!")
+                print(f"   Spent: ₹{spent:,.2f} / ₹{budget['limit']:,.2f} ({percentage_used:.1f}%)")
+                print(f"   Remaining: ₹{budget['limit'] - spent:,.2f}")
     
     def view_budget_status(self):
-        """Display current budget status for all categories"""
+        """Display current budget status for all categories and periods"""
         print("\n" + "="*90)
-        print("💰 BUDGET STATUS - CURRENT MONTH")
+        print("💰 BUDGET STATUS")
         print("="*90)
         
-        current_month = datetime.date.today().strftime('%Y-%m')
-        
         for budget in self.data['budgets']:
             if not budget['active']:
                 continue
             
-            month_expenses = sum(t['amount'] for t in self.data['transactions']
-                               if t['type'] == 'expense' 
-                               and t['category'] == budget['category']
-                               and t['date'].startswith(current_month))
-            
-            percentage_used = (month_expenses / budget['monthly_limit'] * 100) if budget['monthly_limit'] > 0 else 0
-            remaining = budget['monthly_limit'] - month_expenses
+            spent = self.budget_spent(budget)
+            percentage_used = (spent / budget['limit'] * 100) if budget['limit'] > 0 else 0
+            remaining = budget['limit'] - spent
             
             # Visual progress bar
             bar_length = 30
@@ -420,9 +962,9 @@ class FinanceManager:
             else:
                 status = "✅"
             
-            print(f"\n{status} {budget['category']}")
-            print(f"   Budget: ₹{budget['monthly_limit']:,.2f}")
-            print(f"   Spent:  ₹{month_expenses:,.2f} ({percentage_used:.1f}%)")
+            print(f"\n{status} {budget['category']} ({self.budget_period_label(budget)})")
+            print(f"   Budget: ₹{budget['limit']:,.2f}")
+            print(f"   Spent:  ₹{spent:,.2f} ({percentage_used:.1f}%)")
             print(f"   [{bar}]")
             print(f"   Remaining: ₹{remaining:,.2f}")
         
@@ -514,12 +1056,15 @@ class FinanceManager:
         insights = []
         current_date = datetime.date.today()
         
+        current_month = current_date.strftime('%Y-%m')
+        result = self.query({'by_month': ('type', 'month'),
+                             'by_category': ('type', 'month', 'category'),
+                             'by_recurring': ('type', 'month', 'recurring')})
+        
         # Analyze spending trends
-        expense_by_month = defaultdict(float)
-        for trans in self.data['transactions']:
-            if trans['type'] == 'expense':
-                month = trans['date'][:7]
-                expense_by_month[month] += trans['amount']
+        expense_by_month = {month: values['sum']
+                            for (trans_type, month), values in result['by_month'].items()
+                            if trans_type == 'expense'}
         
         if len(expense_by_month) >= 2:
             months = sorted(expense_by_month.keys())
@@ -534,26 +1079,24 @@ class FinanceManager:
                     insights.append(f"📉 Great job! Your spending decreased by {abs(change):.1f}% compared to last month.")
         
         # Identify highest spending category
-        current_month = datetime.date.today().strftime('%Y-%m')
-        category_spending = defaultdict(float)
-        for trans in self.data['transactions']:
-            if trans['type'] == 'expense' and trans['date'].startswith(current_month):
-                category_spending[trans['category']] += trans['amount']
+        category_spending = {category: values['sum']
+                             for (trans_type, month, category), values in result['by_category'].items()
+                             if trans_type == 'expense' and month == current_month}
         
         if category_spending:
             top_category = max(category_spending.items(), key=lambda x: x[1])
             insights.append(f"💸 '{top_category[0]}' is your highest spending category this month: ₹{top_category[1]:,.2f}")
         
         # Check for recurring expenses
-        recurring_expenses = [t for t in self.data['transactions'] 
-                            if t['type'] == 'expense' and t['recurring']]
+        recurring_expenses = [key for key in result['by_recurring']
+                              if key[0] == 'expense' and key[2]]
         if recurring_expenses:
-            total_recurring = sum(t['amount'] for t in recurring_expenses 
-                                if t['date'].startswith(current_month))
+            total_recurring = result['by_recurring'].get(('expense', current_month, True), {'sum': 0})['sum']
             insights.append(f"🔄 Recurring expenses total: ₹{total_recurring:,.2f} per month")
         
         # Savings goal progress check
-        total_income, total_expense, _ = self.get_current_month_summary()
+        total_income = result['by_month'].get(('income', current_month), {'sum': 0})['sum']
+        total_expense = result['by_month'].get(('expense', current_month), {'sum': 0})['sum']
         if total_income > 0:
             current_savings = total_income - total_expense
             for goal in self.data['savings_goals']:
@@ -574,28 +1117,171 @@ class FinanceManager:
         
         print("\n" + "="*90)
     
-    def search_transactions(self, keyword: str):
-        """Search transactions by keyword"""
-        results = []
-        keyword_lower = keyword.lower()
+    def add_rule(self, kind: str, pattern: str = None, category: str = None,
+                 tags: List[str] = None, payment_method: str = None, trans_type: str = None,
+                 min_amount: float = None, max_amount: float = None):
+        """Add a keyword, regex or amount-range categorization rule"""
+        if kind not in RULE_KINDS:
+            print(f"❌ Invalid rule kind! Choose from: {', '.join(RULE_KINDS)}")
+            return
+        if kind == 'keyword' and not WORD_PATTERN.findall((pattern or '').lower()):
+            print("❌ Keyword rules need at least one word!")
+            return
+        if trans_type not in (None, 'income', 'expense'):
+            print("❌ Invalid type! Rules apply to income, expense or both")
+            return
+        if kind == 'regex':
+            if not pattern:
+                print("❌ Regex rules need a pattern!")
+                return
+            try:
+                compiled = re.compile(pattern)
+            except re.error as e:
+                print(f"❌ Invalid regex: {e}")
+                return
+            if compiled.groupindex or UNSUPPORTED_REGEX.search(pattern):
+                print("❌ Regex rules cannot use named groups, backreferences or inline flags "
+                      "(matching is already case-insensitive)!")
+                return
+        if kind == 'amount' and (min_amount is None or
+                                 (max_amount is not None and max_amount <= min_amount)):
+            print("❌ Amount rules need a minimum below the maximum!")
+            return
         
-        for trans in self.data['transactions']:
-            if (keyword_lower in trans['description'].lower() or
-                keyword_lower in trans['category'].lower() or
-                keyword_lower in ' '.join(trans['tags']).lower()):
-                results.append(trans)
+        if category:
+            if not trans_type:
+                print("❌ Rules that set a category must apply to income or expense!")
+                return
+            known = self.normalize_category(category, trans_type)
+            if not known:
+                print(f"❌ Unknown category! Choose from: {', '.join(self.categories_for(trans_type))}")
+                return
+            category = known
+        if not (category or tags or payment_method):
+            print("❌ A rule must set a category, tags or payment method!")
+            return
         
-        if not results:
-            print(f"\nNo transactions found matching '{keyword}'")
+        rule = {
+            'id': max((r['id'] for r in self.data['rules']), default=0) + 1,
+            'kind': kind,
+            'type': trans_type,
+            'category': category,
+            'payment_method': payment_method,
+            'tags': tags or []
+        }
+        if kind == 'amount':
+            rule['min_amount'] = min_amount
+            rule['max_amount'] = max_amount
+        else:
+            rule['pattern'] = pattern
+        
+        self.data['rules'].append(rule)
+        self.rule_set = RuleSet(self.data['rules'])
+        self.save_data()
+        print(f"✓ Rule #{rule['id']} added")
+    
+    def remove_rule(self, rule_id: int):
+        """Remove a categorization rule"""
+        for rule in self.data['rules']:
+            if rule['id'] == rule_id:
+                self.data['rules'].remove(rule)
+                self.rule_set = RuleSet(self.data['rules'])
+                self.save_data()
+                print(f"✓ Rule #{rule_id} removed")
+                return
+        print("❌ Rule not found!")
+    
+    def view_rules(self):
+        """Display categorization rules in priority order"""
+        if not self.data['rules']:
+            print("\nNo categorization rules.")
             return
         
-        print(f"\n🔍 Search Results for '{keyword}' ({len(results)} found)")
+        print("\n" + "="*90)
+        print("🏷  CATEGORIZATION RULES (first match wins)")
         print("="*90)
-        for trans in results:
-            icon = "💰" if trans['type'] == 'income' else "💸"
-            print(f"\n{icon} {trans['date']} | ₹{trans['amount']:,.2f} | {trans['category']}")
-            print(f"   {trans['description']}")
+        for rule in self.data['rules']:
+            if rule['kind'] == 'amount':
+                upper = f"₹{rule['max_amount']:,.2f}" if rule['max_amount'] is not None else "∞"
+                condition = f"amount ₹{rule['min_amount']:,.2f} to {upper}"
+            else:
+                condition = f"{rule['kind']} '{rule['pattern']}'"
+            actions = []
+            if rule.get('category'):
+                actions.append(f"category={rule['category']}")
+            if rule.get('payment_method'):
+                actions.append(f"payment={rule['payment_method']}")
+            if rule.get('tags'):
+                actions.append(f"tags={', '.join(rule['tags'])}")
+            scope = f" [{rule['type']}]" if rule.get('type') else ""
+            print(f"  #{rule['id']}{scope} {condition} → {' | '.join(actions)}")
         print("="*90)
+    
+    def recategorize_all(self):
+        """Re-apply the rules to every transaction, replacing matched categories"""
+        changed = sum(self.apply_rules(trans, overwrite=True) for trans in self.data['transactions'])
+        self.save_data()
+        self.build_budget_windows()
+        print(f"✓ {changed:,} of {len(self.data['transactions']):,} transactions updated")
+    
+    def search_transactions(self, keyword: str, page_size: Optional[int] = PAGE_SIZE,
+                            offset: int = 0, cursor: Tuple[str, int] = None,
+                            compact: bool = False, use_pager: bool = False):
+        """Search transactions by keyword in ledger order, returns the next page cursor"""
+        return self._render_transactions(f"🔍 Search Results for '{keyword}'",
+                                         self.iter_transactions(keyword=keyword),
+                                         page_size, offset, cursor,
+                                         'compact' if compact else 'brief', use_pager,
+                                         f"\nNo transactions found matching '{keyword}'",
+                                         newest_first=False)
+
+
+def benchmark_rules(descriptions: int = 100_000):
+    """Measure categorization throughput on a synthetic corpus as rule counts grow
+    
+    Keyword rules and regex rules are grown separately. Keyword lookups do
+    not depend on the rule count (the slowdown there tracks how many
+    descriptions match), while regex rules cost time in proportion to their count.
+    The regex series runs on a tenth of the corpus to keep it short.
+    """
+    rng = random.Random(42)
+    vocabulary = [''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=rng.randint(3, 9)))
+                  for _ in range(20_000)]
+    corpus = [' '.join(rng.choices(vocabulary, k=rng.randint(3, 8))) for _ in range(descriptions)]
+    amounts = [round(rng.uniform(10, 5000), 2) for _ in corpus]
+    
+    def build_rules(keyword_rules: int, regex_rules: int) -> List[Dict]:
+        rules = [{'id': i + 1, 'kind': 'keyword', 'pattern': ' '.join(rng.sample(vocabulary, rng.choice((1, 1, 2)))),
+                  'type': 'expense', 'category': 'Others', 'tags': [f"tag{i % 50}"]}
+                 for i in range(keyword_rules)]
+        rules += [{'id': len(rules) + i + 1, 'kind': 'regex', 'pattern': rf"\b{word}\w*",
+                   'type': 'expense', 'category': 'Shopping', 'tags': []}
+                  for i, word in enumerate(rng.sample(vocabulary, regex_rules))]
+        rules += [{'id': len(rules) + i + 1, 'kind': 'amount', 'min_amount': i * 250.0,
+                   'max_amount': (i + 1) * 250.0, 'tags': [f"band{i}"]}
+                  for i in range(20)]
+        return rules
+    
+    def run(label: str, rules: List[Dict], size: int):
+        rule_set = RuleSet(rules)
+        start = time.perf_counter()
+        categorized = sum(1 for description, amount in zip(corpus[:size], amounts[:size])
+                          if rule_set.match(description, amount, 'expense')['category'])
+        elapsed = time.perf_counter() - start
+        print(f"  {label:>22s}: {size / elapsed:>10,.0f} descriptions/sec "
+              f"({categorized:,} of {size:,} categorized)")
+    
+    print("\n" + "="*90)
+    print(f"⏱  RULE ENGINE BENCHMARK ({descriptions:,} descriptions)")
+    print("="*90)
+    print("\nGrowing keyword rules (5 regex + 20 amount rules):")
+    for keyword_rules in (10, 100, 1_000, 10_000):
+        run(f"{keyword_rules:,} keyword rules", build_rules(keyword_rules, 5), descriptions)
+    
+    print("\nGrowing regex rules (100 keyword + 20 amount rules):")
+    for regex_rules in (5, 50, 500):
+        run(f"{regex_rules:,} regex rules", build_rules(100, regex_rules), descriptions // 10)
+    print("="*90)
 
 
 def display_menu():
@@ -621,10 +1307,22 @@ def display_menu():
     print("  11. Update Savings Goal")
     print("  12. View Savings Goals")
     
-    print("\n  13. Exit")
+    print("\n🛠  TOOLS")
+    print("  13. Custom Query (Group-by / Pivot)")
+    print("  14. Categorization Rules")
+    print("  15. Re-categorize All Transactions")
+    
+    print("\n  16. Exit")
     print("-"*90)
 
 
+def page_through(show_page):
+    """Show pages of a listing while the user asks for the next one"""
+    cursor = show_page(None)
+    while cursor and input("\nPress 'n' for next page or Enter to stop: ").strip().lower() == 'n':
+        cursor = show_page(cursor)
+
+
 def main():
     """Main application function"""
     manager = FinanceManager()
@@ -643,14 +1341,14 @@ def main():
     """
     while True:
         display_menu()
-        choice = input("\nEnter your choice (1-13): ").strip()
+        choice = input("\nEnter your choice (1-16): ").strip()
         
         if choice == '1':
             print("\n--- Add Income ---")
             try:
                 amount = float(input("Amount (₹): "))
                 print(f"Categories: {', '.join(manager.income_categories)}")
-                category = input("Category: ").strip()
+                category = input("Category (Enter to auto-detect): ").strip()
                 description = input("Description: ").strip()
                 payment_method = input("Payment Method (Bank Transfer/Cash/UPI/Others): ").strip()
                 recurring = input("Recurring? (yes/no): ").strip().lower() == 'yes'
@@ -666,7 +1364,7 @@ def main():
             try:
                 amount = float(input("Amount (₹): "))
                 print(f"Categories: {', '.join(manager.expense_categories)}")
-                category = input("Category: ").strip()
+                category = input("Category (Enter to auto-detect): ").strip()
                 description = input("Description: ").strip()
                 payment_method = input("Payment Method (Cash/Card/UPI/Others): ").strip()
                 recurring = input("Recurring? (yes/no): ").strip().lower() == 'yes'
@@ -678,26 +1376,39 @@ def main():
                 print("❌ Invalid amount!")
         
         elif choice == '3':
-            manager.view_transactions()
+            page_through(lambda cursor: manager.view_transactions(cursor=cursor))
         
         elif choice == '4':
             print("\nFilter by: income, expense")
             filter_type = input("Enter filter type (or 'all'): ").strip()
             month = input("Enter month (YYYY-MM) or press Enter for all: ").strip()
-            manager.view_transactions(filter_type, month if month else None)
+            try:
+                page_size = int(input(f"Rows per page (default {PAGE_SIZE}): ") or PAGE_SIZE)
+            except ValueError:
+                page_size = PAGE_SIZE
+            if page_size <= 0:
+                print(f"⚠️  Rows per page must be positive, using {PAGE_SIZE}")
+                page_size = PAGE_SIZE
+            compact = input("Compact table view? (yes/no): ").strip().lower() == 'yes'
+            use_pager = input("Use pager? (yes/no): ").strip().lower() == 'yes'
+            page_through(lambda cursor: manager.view_transactions(
+                filter_type, month if month else None, page_size, cursor=cursor,
+                compact=compact, use_pager=use_pager))
         
         elif choice == '5':
             keyword = input("Enter search keyword: ").strip()
-            manager.search_transactions(keyword)
+            page_through(lambda cursor: manager.search_transactions(keyword, cursor=cursor))
         
         elif choice == '6':
             print("\n--- Set Budget ---")
             print(f"Categories: {', '.join(manager.expense_categories)}")
             category = input("Category: ").strip()
             try:
-                limit = float(input("Monthly Budget Limit (₹): "))
+                period = input("Period (weekly/monthly/rolling, default monthly): ").strip().lower() or 'monthly'
+                days = int(input("Number of days: ")) if period == 'rolling' else None
+                limit = float(input("Budget Limit (₹): "))
                 threshold = int(input("Alert Threshold % (default 80): ") or "80")
-                manager.set_budget(category, limit, threshold)
+                manager.set_budget(category, limit, threshold, period, days)
             except ValueError:
                 print("❌ Invalid input!")
         
@@ -735,14 +1446,69 @@ def main():
             manager.view_savings_goals()
         
         elif choice == '13':
+            print("\n--- Custom Query ---")
+            print(f"Dimensions: {', '.join(QUERY_DIMENSIONS)}")
+            print(f"Measures: {', '.join(QUERY_MEASURES)}")
+            group_by = tuple(d.strip() for d in input("Group by (comma-separated): ").split(',') if d.strip())
+            measures = tuple(m.strip() for m in input("Measures (default sum): ").split(',') if m.strip())
+            print("\nFilters (press Enter to skip)")
+            filter_type = input("Type (income/expense): ").strip().lower() or 'all'
+            recurring = input("Recurring? (yes/no): ").strip().lower()
+            filters = {
+                'start_date': input("From date (YYYY-MM-DD): ").strip() or None,
+                'end_date': input("To date (YYYY-MM-DD): ").strip() or None,
+                'category': input("Category: ").strip() or None,
+                'tag': input("Tag: ").strip() or None,
+                'payment_method': input("Payment Method: ").strip() or None,
+                'recurring': {'yes': True, 'no': False}.get(recurring),
+            }
+            try:
+                manager.view_pivot(group_by, measures or ('sum',), filter_type, **filters)
+            except ValueError as e:
+                print(f"❌ {e}")
+        
+        elif choice == '14':
+            manager.view_rules()
+            print("\nActions: add, remove (or press Enter to go back)")
+            action = input("Action: ").strip().lower()
+            try:
+                if action == 'add':
+                    print(f"Rule kinds: {', '.join(RULE_KINDS)}")
+                    kind = input("Kind: ").strip().lower()
+                    pattern = min_amount = max_amount = None
+                    if kind == 'amount':
+                        min_amount = float(input("Minimum Amount (₹): "))
+                        max_amount = input("Maximum Amount (₹, Enter for no limit): ").strip()
+                        max_amount = float(max_amount) if max_amount else None
+                    else:
+                        pattern = input("Keyword / Regex: ").strip()
+                    trans_type = input("Applies to (income/expense, Enter for both; required for a category): ").strip().lower() or None
+                    category = input("Category (optional): ").strip() or None
+                    payment_method = input("Payment Method (optional): ").strip() or None
+                    tags = input("Tags (comma-separated, optional): ").strip()
+                    tag_list = [t.strip() for t in tags.split(',')] if tags else []
+                    manager.add_rule(kind, pattern, category, tag_list, payment_method,
+                                     trans_type, min_amount, max_amount)
+                elif action == 'remove':
+                    manager.remove_rule(int(input("Rule ID: ")))
+            except ValueError:
+                print("❌ Invalid input!")
+        
+        elif choice == '15':
+            manager.recategorize_all()
+        
+        elif choice == '16':
             print("\n💰 Keep tracking your finances! Goodbye! 👋")
             break
         
         else:
-            print("\n❌ Invalid choice! Please select 1-13.")
+            print("\n❌ Invalid choice! Please select 1-16.")
         
         input("\nPress Enter to continue...")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if sys.argv[1:] == ['--benchmark-rules']:
+        benchmark_rules()
+    else:
+        main()
\ No newline at end of file